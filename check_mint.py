@@ -1,26 +1,38 @@
-import subprocess
-import json
+from pathlib import Path
 from solana.rpc.api import Client
 from solders.pubkey import Pubkey
 
+# Same .env lookup as tests/p2p_verify.py so both scripts query the same cluster
+try:
+    with open(Path(__file__).with_name(".env"), "r") as f:
+        ENV = dict(line.strip().split("=", 1) for line in f if "=" in line and not line.startswith("#"))
+except FileNotFoundError:
+    ENV = {}
+
+SOLANA_RPC_URL = ENV.get("SOLANA_RPC_URL", "http://localhost:8899")
 ENERGY_TOKEN_PROGRAM_ID = Pubkey.from_string("5T7PuWV6wbzhJP9WDfDegPMGRiadMhxHrUc2n2LAB9gY")
 SEEDS = [b"mint"]
 
-mint_pda, bump = Pubkey.find_program_address(SEEDS, ENERGY_TOKEN_PROGRAM_ID)
-print(f"Mint Address: {mint_pda}")
+# Seeds and program id are fixed, so the PDA is too: precomputed with
+# Pubkey.find_program_address(SEEDS, ENERGY_TOKEN_PROGRAM_ID)
+MINT_PDA = Pubkey.from_string("FGDnCdYgAXYedZZniLVgNMUXqdrPVZDQfqHzVktk2E7a")
+MINT_BUMP = 254
+
+# Sanity check against the constants with a single hash at the known bump
+# instead of the bump search; stripped entirely under `python -O`
+assert Pubkey.create_program_address(SEEDS + [bytes([MINT_BUMP])], ENERGY_TOKEN_PROGRAM_ID) == MINT_PDA, \
+    "MINT_PDA/MINT_BUMP out of date for ENERGY_TOKEN_PROGRAM_ID"
+
+print(f"Mint Address: {MINT_PDA}")
 
-# Use solana CLI to get account info
+# Query the RPC node directly instead of shelling out to the solana CLI
+client = Client(SOLANA_RPC_URL)
 try:
-    result = subprocess.run(
-        ["solana", "account", str(mint_pda), "--output", "json"],
-        capture_output=True,
-        text=True
-    )
-    if result.returncode == 0:
-        data = json.loads(result.stdout)
-        print(f"Owner: {data.get('owner')}")
-        print(f"Data: {data}")
+    account = client.get_account_info_json_parsed(MINT_PDA).value
+    if account is not None:
+        print(f"Owner: {account.owner}")
+        print(f"Data: {account.data}")
     else:
-        print(f"Error getting account: {result.stderr}")
+        print(f"Error getting account: {MINT_PDA} not found")
 except Exception as e:
     print(f"Exception: {e}")
@@ -35,7 +35,7 @@ pub use routes::{
 
 // Re-export handler functions
 pub use login::{login, verify_email};
-pub use registration::{register, resend_verification};
+pub use registration::{register, bootstrap, resend_verification};
 pub use password_reset::{forgot_password, reset_password, change_password};
 pub use profile::profile;
 pub use meters::{
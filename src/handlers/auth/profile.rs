@@ -179,6 +179,16 @@ pub async fn generate_wallet(
 
     info!("🔑 Wallet generation request for user: {}", claims.sub);
 
+    provision_wallet(&state, claims.sub).await.map(Json)
+}
+
+/// Generate, encrypt and store a new custodial wallet for `user_id`, then airdrop initial SOL.
+///
+/// Shared by `generate_wallet` and the one-shot `bootstrap` registration handler.
+pub(crate) async fn provision_wallet(
+    state: &AppState,
+    user_id: Uuid,
+) -> Result<UserResponse, crate::ApiError> {
     // Generate new keypair
     let new_keypair = Keypair::new();
     let pubkey = new_keypair.pubkey().to_string();
@@ -209,7 +219,7 @@ pub async fn generate_wallet(
     .bind(&enc_key_bytes)
     .bind(&salt_bytes)
     .bind(&iv_bytes)
-    .bind(claims.sub)
+    .bind(user_id)
     .fetch_one(&state.db)
     .await
     .map_err(|e| {
@@ -229,7 +239,7 @@ pub async fn generate_wallet(
         }
     }
 
-    Ok(Json(UserResponse {
+    Ok(UserResponse {
         id: user.id,
         username: user.username,
         email: user.email,
@@ -240,5 +250,5 @@ pub async fn generate_wallet(
                 balance: user.balance.unwrap_or_default(),
                 locked_amount: user.locked_amount.unwrap_or_default(),
                 locked_energy: user.locked_energy.unwrap_or_default(),
-    }))
+    })
 }
@@ -149,6 +149,41 @@ pub async fn register(
     }))
 }
 
+/// Bootstrap Handler - registers a user, issues a token and provisions a custodial wallet in one call
+///
+/// Collapses the register -> login -> wallet setup sequence that scripted clients
+/// otherwise perform as three separate round-trips.
+#[utoipa::path(
+    post,
+    path = "/api/v1/users/bootstrap",
+    request_body = RegistrationRequest,
+    responses(
+        (status = 200, description = "User registered with token and wallet", body = AuthResponse),
+        (status = 400, description = "Registration failed"),
+        (status = 500, description = "Internal server error")
+    ),
+    tag = "users"
+)]
+pub async fn bootstrap(
+    State(state): State<AppState>,
+    Json(request): Json<RegistrationRequest>,
+) -> Result<Json<AuthResponse>, ApiError> {
+    info!("🚀 Bootstrap for user: {} (email: {})", request.username, request.email);
+
+    let Json(registration) = register(State(state.clone()), Json(request)).await?;
+    let auth = registration
+        .auth
+        .ok_or_else(|| ApiError::BadRequest(registration.message))?;
+
+    let user = super::profile::provision_wallet(&state, auth.user.id).await?;
+
+    Ok(Json(AuthResponse {
+        access_token: auth.access_token,
+        expires_in: auth.expires_in,
+        user,
+    }))
+}
+
 /// Resend verification email
 #[utoipa::path(
     post,
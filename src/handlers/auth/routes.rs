@@ -10,7 +10,7 @@ use axum::{
 use crate::AppState;
 use super::{
     login::{login, verify_email},
-    registration::register,
+    registration::{register, bootstrap},
     password_reset::{forgot_password, reset_password, change_password},
     profile::{profile, update_wallet, generate_wallet},
     meters::{
@@ -40,6 +40,7 @@ pub fn v1_auth_routes() -> Router<AppState> {
 pub fn v1_users_routes() -> Router<AppState> {
     Router::new()
         .route("/", post(register))  // POST /api/v1/users (register)
+        .route("/bootstrap", post(bootstrap))  // POST /api/v1/users/bootstrap (register + token + wallet)
         .route("/me", get(profile))  // GET /api/v1/users/me
         .route("/me/meters", get(get_my_meters))  // GET /api/v1/users/me/meters
         .route("/wallet", post(update_wallet)) // POST /api/v1/users/wallet
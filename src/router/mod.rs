@@ -39,6 +39,7 @@ use crate::middleware::{metrics_middleware, active_requests_middleware};
         crate::handlers::auth::login::login,
         crate::handlers::auth::login::verify_email,
         crate::handlers::auth::registration::register,
+        crate::handlers::auth::registration::bootstrap,
         crate::handlers::auth::registration::resend_verification,
         crate::handlers::auth::profile::profile,
         crate::handlers::auth::password_reset::forgot_password,
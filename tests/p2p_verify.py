@@ -1,35 +1,105 @@
 
-import requests
-import json
+import asyncio
+import base64
+import hashlib
+import httpx
+import orjson
+import secrets
+import socket
 import time
-import random
-import uuid
+import websockets
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from pathlib import Path
+from cryptography.fernet import Fernet, InvalidToken
+from solana.rpc.providers.http import HTTPProvider
+from solders.account_decoder import UiAccountEncoding
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.rpc.config import RpcAccountInfoConfig
+from solders.rpc.requests import GetAccountInfo, GetLatestBlockhash, SendLegacyTransaction
+from solders.rpc.responses import GetAccountInfoResp, GetLatestBlockhashResp, SendTransactionResp
+from solders.transaction import Transaction
+from spl.token.instructions import (
+    MintToParams,
+    create_idempotent_associated_token_account,
+    get_associated_token_address,
+    mint_to,
+)
 
 # Configuration
-import subprocess
 import os
 
 # Configuration
-BASE_URL = "http://localhost:4000/api/v1"
-SELLER_EMAIL = f"seller_{random.randint(1000,9999)}@test.com"
-BUYER_EMAIL = f"buyer_{random.randint(1000,9999)}@test.com"
+# GATEWAY_URL points the script at a deployed gateway (e.g. https://gateway.example.com).
+# The local default resolves localhost once at import so no connection pays for a getaddrinfo lookup.
+GATEWAY_URL = os.environ.get("GATEWAY_URL", "").rstrip("/") or f"http://{socket.gethostbyname('localhost')}:4000"
+BASE_URL = f"{GATEWAY_URL}/api/v1"
+WS_URL = f"{GATEWAY_URL.replace('http', 'ws', 1)}/ws"
+# httpx only negotiates HTTP/2 via TLS ALPN, so it is only enabled (and h2 only needed) for https gateways
+USE_HTTP2 = GATEWAY_URL.startswith("https://")
+# Set P2P_SELLER_EMAIL / P2P_BUYER_EMAIL to reuse the same accounts across runs; only those are token-cached
+SELLER_EMAIL = os.environ.get("P2P_SELLER_EMAIL") or f"seller_{secrets.token_hex(2)}@test.com"
+BUYER_EMAIL = os.environ.get("P2P_BUYER_EMAIL") or f"buyer_{secrets.token_hex(2)}@test.com"
 PASSWORD = "StrongP@ssw0rd!2025"
+TOKEN_CACHE_DIR = Path.home() / ".gridtokenx_tokens"
+FILLED_STATUSES = ("filled", "settled")
 
-def get_env_var(key):
-    try:
-        with open("../.env", "r") as f:
-            for line in f:
-                if line.startswith(f"{key}="):
-                    return line.strip().split("=")[1]
-    except Exception:
-        pass
-    return None
+# Parse ../.env once at import time rather than rescanning the file per key
+try:
+    with open("../.env", "r") as f:
+        ENV = dict(line.strip().split("=", 1) for line in f if "=" in line and not line.startswith("#"))
+except FileNotFoundError:
+    ENV = {}
+
+CURRENCY_MINT = ENV.get("CURRENCY_TOKEN_MINT")
+SOLANA_RPC_URL = ENV.get("SOLANA_RPC_URL", "http://localhost:8899")
+DEV_WALLET_PATH = "../dev-wallet.json"
+
+# Offset of the `decimals` byte in an SPL Token / Token-2022 mint account
+MINT_DECIMALS_OFFSET = 44
+
+
+def fund_with_currency(owner, amount):
+    """Create `owner`'s currency ATA if needed and mint `amount` tokens to it in one transaction."""
+    provider = HTTPProvider(SOLANA_RPC_URL)
+    with open(DEV_WALLET_PATH) as f:
+        payer = Keypair.from_bytes(orjson.loads(f.read()))
+    mint = Pubkey.from_string(CURRENCY_MINT)
+    owner = Pubkey.from_string(owner)
+
+    # Both reads go out as one JSON-RPC batch: a single round-trip for the mint and the blockhash.
+    # The mint account tells us both its token program (Token vs Token-2022) and its decimals
+    mint_resp, blockhash_resp = provider.make_batch_request(
+        (
+            GetAccountInfo(mint, RpcAccountInfoConfig(UiAccountEncoding.Base64), id=0),
+            GetLatestBlockhash(id=1),
+        ),
+        (GetAccountInfoResp, GetLatestBlockhashResp),
+    )
+    mint_account = mint_resp.value
+    if mint_account is None:
+        raise RuntimeError(f"Currency mint {mint} not found on {SOLANA_RPC_URL}")
+    token_program = mint_account.owner
+    decimals = mint_account.data[MINT_DECIMALS_OFFSET]
+    ata = get_associated_token_address(owner, mint, token_program)
 
-CURRENCY_MINT = get_env_var("CURRENCY_TOKEN_MINT")
+    instructions = [
+        create_idempotent_associated_token_account(payer.pubkey(), owner, mint, token_program),
+        mint_to(MintToParams(
+            program_id=token_program,
+            mint=mint,
+            dest=ata,
+            mint_authority=payer.pubkey(),
+            amount=amount * 10 ** decimals,
+        )),
+    ]
+    blockhash = blockhash_resp.value.blockhash
+    tx = Transaction.new_signed_with_payer(instructions, payer.pubkey(), [payer], blockhash)
+    return provider.make_request(SendLegacyTransaction(tx), SendTransactionResp).value
 
 
 class GridTokenXClient:
-    def __init__(self, email, password, role="user"):
+    def __init__(self, email, password, role="user", cache_tokens=False):
         self.email = email
         self.password = password
         self.role = role
@@ -38,47 +108,143 @@ class GridTokenXClient:
         self.wallet = None
         self.meter_serial = None
         self.meter_id = None
+        self.token_from_cache = False
+        # Throwaway accounts would only litter TOKEN_CACHE_DIR with files that never hit again
+        self.cache_tokens = cache_tokens
+        # Cached tokens are encrypted with a key derived from the credentials,
+        # so the file on disk is useless without the email/password pair
+        cache_name = hashlib.sha1(f"{email}{password}".encode()).hexdigest()
+        self.token_cache_path = TOKEN_CACHE_DIR / f"{cache_name}.json"
+        self.fernet = Fernet(base64.urlsafe_b64encode(hashlib.sha256(f"{email}:{password}".encode()).digest()))
+        # One pooled keep-alive client per actor. Against an https gateway, HTTP/2 lets
+        # concurrent calls share a single multiplexed connection.
+        # The Authorization header is shared by every call, so it lives on the client (see apply_auth).
+        self.client = httpx.AsyncClient(
+            http2=USE_HTTP2,
+            limits=httpx.Limits(max_connections=20),
+            timeout=30,
+        )
 
-    def register(self):
-        print(f"[{self.email}] Registering...")
-        url = f"{BASE_URL}/users"
-        data = {
+    async def close(self):
+        await self.client.aclose()
+
+    def load_cached_token(self):
+        if not self.cache_tokens:
+            return False
+        try:
+            cached = orjson.loads(self.fernet.decrypt(self.token_cache_path.read_bytes()))
+        except (OSError, InvalidToken, ValueError):
+            return False
+        if cached.get("exp", 0) <= time.time():
+            self.token_cache_path.unlink(missing_ok=True)
+            return False
+        self.token = cached["token"]
+        self.user_id = cached["user_id"]
+        self.wallet = cached.get("wallet")
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+        self.token_from_cache = True
+        return True
+
+    def store_cached_token(self, expires_in):
+        if not self.cache_tokens:
+            return
+        TOKEN_CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+        cached = {
+            "token": self.token,
+            "user_id": self.user_id,
+            "wallet": self.wallet,
+            "exp": time.time() + expires_in
+        }
+        self.token_cache_path.write_bytes(self.fernet.encrypt(orjson.dumps(cached)))
+
+    async def send(self, method, url, json=None, **kwargs):
+        if json is not None:
+            # orjson encodes straight to bytes, skipping httpx's stdlib json.dumps
+            kwargs["content"] = orjson.dumps(json)
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        resp = await self.client.request(method, url, **kwargs)
+        if resp.status_code == 401 and self.token_from_cache:
+            # Cached token was rejected (revoked, server secret rotated...): log in for real and retry once
+            print(f"[{self.email}] Cached token rejected, logging in again...")
+            self.token_cache_path.unlink(missing_ok=True)
+            self.token_from_cache = False
+            self.client.headers.pop("Authorization", None)
+            await self.login()
+            resp = await self.client.request(method, url, **kwargs)
+        return resp
+
+    def registration_payload(self):
+        return {
             "username": self.email.split("@")[0],
             "email": self.email,
             "password": self.password,
             "first_name": "Test",
             "last_name": "User"
         }
-        resp = requests.post(url, json=data)
-        if resp.status_code == 200 or resp.status_code == 201:
-            print(f"[{self.email}] Registered successfully.")
+
+    def apply_auth(self, auth_data):
+        self.token = auth_data["access_token"]
+        self.user_id = auth_data["user"]["id"]
+        self.wallet = auth_data["user"].get("wallet_address")
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+        self.token_from_cache = False
+        self.store_cached_token(auth_data.get("expires_in", 0))
+
+    async def _request(self, method, path, **kwargs):
+        """send() against BASE_URL; raises httpx.HTTPStatusError on non-2xx, returns the decoded body ({} if empty)."""
+        resp = await self.send(method, f"{BASE_URL}{path}", **kwargs)
+        resp.raise_for_status()
+        return orjson.loads(resp.content) if resp.content else {}
+
+    async def bootstrap(self):
+        """Register, log in and provision a wallet in a single round-trip."""
+        if self.load_cached_token():
+            print(f"[{self.email}] Using cached token. Wallet: {self.wallet}")
         else:
-            print(f"[{self.email}] Registration failed: {resp.text}")
-            # Try login if already exists
-            
-    def login(self):
+            print(f"[{self.email}] Bootstrapping...")
+            try:
+                self.apply_auth(await self._request("POST", "/users/bootstrap", json=self.registration_payload()))
+                print(f"[{self.email}] Bootstrap success. Wallet: {self.wallet}")
+                return
+            except httpx.HTTPStatusError as e:
+                # Older gateways (or an already registered account) take the three-step path
+                print(f"[{self.email}] Bootstrap unavailable ({e.response.status_code}), falling back to register/login...")
+            await self.register()
+            await self.login()
+        if not self.wallet:
+            # The cache may predate wallet generation; only generate one if the account really has none
+            await self.get_profile()
+        if not self.wallet:
+            await self.setup_wallet()
+
+    async def register(self):
+        print(f"[{self.email}] Registering...")
+        try:
+            await self._request("POST", "/users", json=self.registration_payload())
+            print(f"[{self.email}] Registered successfully.")
+        except httpx.HTTPStatusError as e:
+            # Not fatal: the account may already exist, login decides
+            print(f"[{self.email}] Registration failed: {e.response.text}")
+
+    async def login(self):
+        if self.load_cached_token():
+            print(f"[{self.email}] Using cached token. Wallet: {self.wallet}")
+            return
         print(f"[{self.email}] Logging in...")
-        url = f"{BASE_URL}/auth/token"
         data = {
             "username": self.email,
             "password": self.password
         }
-        resp = requests.post(url, json=data)
-        if resp.status_code == 200:
-            auth_data = resp.json()
-            self.token = auth_data["access_token"]
-            self.user_id = auth_data["user"]["id"]
-            self.wallet = auth_data["user"].get("wallet_address")
-            print(f"[{self.email}] Login success. Wallet: {self.wallet}")
-        else:
-            print(f"[{self.email}] Login failed: {resp.text}")
-            exit(1)
+        try:
+            self.apply_auth(await self._request("POST", "/auth/token", json=data))
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Login failed: {e.response.text}")
+            raise SystemExit(1)
+        print(f"[{self.email}] Login success. Wallet: {self.wallet}")
 
-    def register_meter(self):
+    async def register_meter(self):
         print(f"[{self.email}] Registering meter...")
-        self.meter_serial = f"SERIAL-{uuid.uuid4().hex[:8].upper()}"
-        url = f"{BASE_URL}/meters"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        self.meter_serial = f"SERIAL-{secrets.token_hex(4).upper()}"
         data = {
             "serial_number": self.meter_serial,
             "meter_type": "Solar_Prosumer",
@@ -86,49 +252,41 @@ class GridTokenXClient:
             "latitude": 13.7563,
             "longitude": 100.5018
         }
-        resp = requests.post(url, json=data, headers=headers)
-        if resp.status_code == 200 or resp.status_code == 201:
-            meter_data = resp.json()
-            self.meter_id = meter_data["meter"]["id"] if "meter" in meter_data else None
-            print(f"[{self.email}] Meter registered: {self.meter_serial}")
-        else:
-            print(f"[{self.email}] Meter registration failed: {resp.text}")
-            exit(1)
+        try:
+            meter_data = await self._request("POST", "/meters", json=data)
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Meter registration failed: {e.response.text}")
+            raise SystemExit(1)
+        self.meter_id = meter_data["meter"]["id"] if "meter" in meter_data else None
+        print(f"[{self.email}] Meter registered: {self.meter_serial}")
 
-    def submit_reading(self, kwh, auto_mint=False):
+    async def submit_reading(self, kwh, auto_mint=False):
         print(f"[{self.email}] Submitting reading for {kwh} kWh (AutoSprint={auto_mint})...")
-        url = f"{BASE_URL}/meters/{self.meter_serial}/readings"
-        headers = {"Authorization": f"Bearer {self.token}"}
         params = {"auto_mint": str(auto_mint).lower()}
         data = {
             "kwh": kwh,
              # Request requires float, ensuring it works
         }
-        resp = requests.post(url, json=data, headers=headers, params=params)
-        if resp.status_code == 200 or resp.status_code == 201:
-            reading = resp.json()
-            print(f"[{self.email}] Reading submitted. Response: {json.dumps(reading)}")
-            return reading
-        else:
-            print(f"[{self.email}] Reading submission failed: {resp.text}")
-            exit(1)
+        try:
+            reading = await self._request("POST", f"/meters/{self.meter_serial}/readings", json=data, params=params)
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Reading submission failed: {e.response.text}")
+            raise SystemExit(1)
+        print(f"[{self.email}] Reading submitted. Response: {orjson.dumps(reading).decode()}")
+        return reading
 
-    def mint_reading(self, reading_id):
+    async def mint_reading(self, reading_id):
         print(f"[{self.email}] Minting reading {reading_id}...")
-        url = f"{BASE_URL}/meters/readings/{reading_id}/mint"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        resp = requests.post(url, headers=headers)
-        if resp.status_code == 200:
-            print(f"[{self.email}] Mint success: {resp.json().get('transaction_signature')}")
-            return True
-        else:
-            print(f"[{self.email}] Mint failed: {resp.text}")
+        try:
+            mint_data = await self._request("POST", f"/meters/readings/{reading_id}/mint")
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Mint failed: {e.response.text}")
             return False
+        print(f"[{self.email}] Mint success: {mint_data.get('transaction_signature')}")
+        return True
 
-    def create_order(self, side, amount, price):
+    async def create_order(self, side, amount, price):
         print(f"[{self.email}] Creating {side} Limit order: {amount} kWh @ {price} GRX...")
-        url = f"{BASE_URL}/trading/orders"
-        headers = {"Authorization": f"Bearer {self.token}"}
         data = {
             "side": side.lower(),
             "order_type": "limit",
@@ -136,138 +294,200 @@ class GridTokenXClient:
             "price_per_kwh": price,
             "zone_id": 1
         }
-        resp = requests.post(url, json=data, headers=headers)
-        if resp.status_code == 200 or resp.status_code == 201:
-            order_data = resp.json()
-            # print(f"Order Creation Response: {order_data}")
-            order_id = order_data.get("id", "unknown") 
-            print(f"[{self.email}] Order created. ID: {order_id}")
-            return order_id
-        else:
-            print(f"[{self.email}] Order creation failed: {resp.text}")
-            exit(1)
-
-    def get_profile(self):
-        url = f"{BASE_URL}/users/me"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            user_data = resp.json()
-            self.wallet = user_data.get("wallet_address")
-            print(f"[{self.email}] Profile refreshed. Wallet: {self.wallet}")
-        else:
-            print(f"[{self.email}] Failed to get profile: {resp.text}")
-
-    def setup_wallet(self):
-        print(f"[{self.email}] Setting up wallet (via dummy order)...")
-        # Create a dummy buy order to trigger wallet generation
-        # We use a small amount and price to ensure it passes basic validation
-        url = f"{BASE_URL}/trading/orders"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        data = {
-            "side": "buy",
-            "order_type": "limit",
-            "energy_amount": 1.0,
-            "price_per_kwh": 1.0,
-            "zone_id": 1
-        }
-        # We expect this might succeed or fail, but the side effect is wallet generation
-        resp = requests.post(url, json=data, headers=headers)
-        # print(f"Dummy order response: {resp.status_code} {resp.text}")
-        # Refresh profile to get wallet
-        self.get_profile()
-
-    def get_my_orders(self):
-        url = f"{BASE_URL}/trading/orders"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            json_resp = resp.json()
-            return json_resp.get("data", [])
-        return []
-
-def main():
+        try:
+            order_data = await self._request("POST", "/trading/orders", json=data)
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Order creation failed: {e.response.text}")
+            raise SystemExit(1)
+        order_id = order_data.get("id", "unknown")
+        print(f"[{self.email}] Order created. ID: {order_id}")
+        return order_id
+
+    async def get_profile(self):
+        try:
+            user_data = await self._request("GET", "/users/me")
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Failed to get profile: {e.response.text}")
+            return
+        self.wallet = user_data.get("wallet_address")
+        print(f"[{self.email}] Profile refreshed. Wallet: {self.wallet}")
+
+    async def setup_wallet(self):
+        print(f"[{self.email}] Generating wallet...")
+        try:
+            user_data = await self._request("POST", "/users/wallet/generate")
+        except httpx.HTTPStatusError as e:
+            print(f"[{self.email}] Wallet generation failed: {e.response.text}")
+            return
+        self.wallet = user_data.get("wallet_address")
+        print(f"[{self.email}] Wallet: {self.wallet}")
+
+    async def get_my_orders(self):
+        try:
+            json_resp = await self._request("GET", "/trading/orders")
+        except httpx.HTTPStatusError:
+            return []
+        return json_resp.get("data", [])
+
+    async def open_order_stream(self):
+        """Open the per-user WebSocket feed; None if the gateway does not expose it."""
+        try:
+            return await websockets.connect(f"{WS_URL}?token={self.token}")
+        except (OSError, asyncio.TimeoutError, InvalidHandshake) as e:
+            print(f"[{self.email}] Order stream unavailable ({e}), falling back to polling.")
+            return None
+
+    async def order_filled(self, order_id):
+        for o in await self.get_my_orders():
+            if isinstance(o, dict) and o.get("id") == order_id:
+                return o.get("status") in FILLED_STATUSES
+        return False
+
+    async def reading_minted(self, reading_id):
+        try:
+            readings = await self._request("GET", "/meters/readings", params={"serial_number": self.meter_serial})
+        except httpx.HTTPStatusError:
+            return False
+        for r in readings:
+            if r.get("id") == reading_id:
+                return bool(r.get("tx_signature"))
+        return False
+
+async def poll_until(predicate, interval=0.3, timeout=20):
+    """Await predicate() every `interval` seconds until it is truthy; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if await predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(interval)
+
+async def stream_until_filled(streams, timeout=15):
+    """Wait on (websocket, order_id) pairs until every order reports filled.
+
+    Returns False on timeout and None if a stream dropped or sent garbage, in which case
+    the caller should fall back to polling.
+    """
+    async def filled(ws, order_id):
+        try:
+            async for raw in ws:
+                msg = orjson.loads(raw)
+                if (isinstance(msg, dict) and msg.get("type") == "P2POrderUpdate" and msg.get("order_id") == order_id
+                        and msg.get("status") in FILLED_STATUSES):
+                    return True
+        except (ConnectionClosed, ValueError) as e:
+            print(f"Order stream failed ({e!r}), falling back to polling.")
+        return None
+
+    tasks = [asyncio.ensure_future(filled(ws, order_id)) for ws, order_id in streams]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=timeout):
+            result = await next_done
+            if result is None:
+                return None
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def main():
     print("=== Starting P2P Verification ===")
 
-    # 1. Setup Seller
-    seller = GridTokenXClient(SELLER_EMAIL, PASSWORD)
-    seller.register()
-    seller.login()
-    seller.setup_wallet() # Generate wallet
-    seller.register_meter()
-    
-    # 2. Setup Buyer
-    buyer = GridTokenXClient(BUYER_EMAIL, PASSWORD)
-    buyer.register()
-    buyer.login()
-    buyer.setup_wallet() # Generate wallet
-    
-    # Buyer needs tokens too? No, buyer buys Energy Tokens using what? 
+    seller = GridTokenXClient(SELLER_EMAIL, PASSWORD, cache_tokens="P2P_SELLER_EMAIL" in os.environ)
+    buyer = GridTokenXClient(BUYER_EMAIL, PASSWORD, cache_tokens="P2P_BUYER_EMAIL" in os.environ)
+    try:
+        await run(seller, buyer)
+    finally:
+        await asyncio.gather(seller.close(), buyer.close())
+
+async def run(seller, buyer):
+    # 1-2. Setup Seller and Buyer concurrently; the two actors share no state
+    # /users/bootstrap registers, authenticates and generates the wallet in one request per actor
+    await asyncio.gather(seller.bootstrap(), buyer.bootstrap())
+    await seller.register_meter()
+
+    # Buyer needs tokens too? No, buyer buys Energy Tokens using what?
     # In this system, orders are created.
-    
+
     # 3. Seller Mints Tokens
     # Submit reading
     # Now that seller has wallet, reading submission should work
-    reading = seller.submit_reading(50.0, auto_mint=False)
-    time.sleep(1)
-    
+    reading = await seller.submit_reading(50.0, auto_mint=False)
+    await asyncio.sleep(1)
+
     # Mint manually
-    success = seller.mint_reading(reading["id"])
+    success = await seller.mint_reading(reading["id"])
     if not success:
         print("!!! Setup failed: Could not mint tokens for seller.")
-        exit(1)
-        
+        raise SystemExit(1)
+
     print("Waiting for mint confirmation...")
-    time.sleep(5) 
+    if not await poll_until(lambda: seller.reading_minted(reading["id"]), timeout=5):
+        print("WARNING: Mint not confirmed after 5s, continuing anyway.")
 
     # 3b. Fund Buyer with Currency
     if CURRENCY_MINT:
         print(f"[{buyer.email}] Funding with Currency ({CURRENCY_MINT})...")
         try:
-             # Ensure buyer has ATA
-            subprocess.run(
-                ["spl-token", "create-account", CURRENCY_MINT, "--owner", buyer.wallet, "--fee-payer", "dev-wallet.json"],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=".."
-            )
-            # Mint tokens
-            subprocess.run(
-                ["spl-token", "mint", CURRENCY_MINT, "1000", buyer.wallet, "--fee-payer", "dev-wallet.json", "--mint-authority", "dev-wallet.json"],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=".."
-            )
-            print(f"[{buyer.email}] Funded with 1000 Currency Tokens.")
+            # ATA creation and mint land in a single signed transaction
+            signature = fund_with_currency(buyer.wallet, 1000)
+            print(f"[{buyer.email}] Funded with 1000 Currency Tokens. Tx: {signature}")
         except Exception as e:
             print(f"Failed to fund buyer: {e}")
     else:
         print("WARNING: CURRENCY_TOKEN_MINT not found in .env, buyer might fail to lock escrow.")
-    
-    # 4. Create Orders
-    price = 2.0
-    amount = 10.0
-    
-    # Seller Sells
-    seller_order_id = seller.create_order("sell", amount, price)
-    
-    # Buyer Buys
-    buyer_order_id = buyer.create_order("buy", amount, price)
-    
-    # 5. Wait for matching
-    print("Waiting for matching engine (15s)...")
-    time.sleep(15)
-    
+
+    # Subscribe to order updates before placing orders so no fill event can be missed
+    seller_ws, buyer_ws = await asyncio.gather(seller.open_order_stream(), buyer.open_order_stream())
+    try:
+        # 4. Create Orders
+        price = 2.0
+        amount = 10.0
+
+        # Both legs are independent (different users, different sides), so submit them together:
+        # one RTT instead of two and no skew between them reaching the matching engine
+        seller_order_id, buyer_order_id = await asyncio.gather(
+            seller.create_order("sell", amount, price),
+            buyer.create_order("buy", amount, price),
+        )
+
+        # 5. Wait for matching
+        async def both_filled():
+            seller_filled, buyer_filled = await asyncio.gather(
+                seller.order_filled(seller_order_id),
+                buyer.order_filled(buyer_order_id),
+            )
+            return seller_filled and buyer_filled
+
+        print("Waiting for matching engine (up to 15s)...")
+        deadline = time.monotonic() + 15
+        filled = None
+        if seller_ws and buyer_ws:
+            filled = await stream_until_filled([(seller_ws, seller_order_id), (buyer_ws, buyer_order_id)], timeout=15)
+        if filled is None:
+            filled = await poll_until(both_filled, timeout=max(0, deadline - time.monotonic()))
+        if not filled:
+            print("WARNING: Orders not filled after 15s.")
+    finally:
+        await asyncio.gather(*(ws.close() for ws in (seller_ws, buyer_ws) if ws))
+
     # 6. Check status
     print("Checking Seller Orders...")
-    seller_orders = seller.get_my_orders()
+    seller_orders = await seller.get_my_orders()
     # print(f"Seller Orders Dump: {seller_orders}")
-    
+
     for o in seller_orders:
         # Check if o is dict
         if isinstance(o, dict) and o.get("id") == seller_order_id:
             print(f"Seller Order Status: {o.get('status')} (Filled: {o.get('filled_amount')})")
         elif isinstance(o, str) and o == seller_order_id:
              print(f"Seller Order Found (ID only): {o}")
-            
+
     print("Checking Buyer Orders...")
-    buyer_orders = buyer.get_my_orders()
+    buyer_orders = await buyer.get_my_orders()
     for o in buyer_orders:
         if isinstance(o, dict) and o.get("id") == buyer_order_id:
             print(f"Buyer Order Status: {o.get('status')} (Filled: {o.get('filled_amount')})")
@@ -275,8 +495,8 @@ def main():
              print(f"Buyer Order Found (ID only): {o}")
 
     # TODO: Check settlements endpoint if available or database
-    
+
     print("=== Verification Complete ===")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -194,6 +194,80 @@ mod auth_tests {
         assert_eq!(response.status(), StatusCode::BAD_REQUEST);
     }
     
+    #[tokio::test]
+    async fn test_user_bootstrap_success() {
+        // Setup
+        let app_state = create_test_app_state().await;
+        let app = create_app(app_state);
+        
+        let suffix = Uuid::new_v4().simple().to_string();
+        let email = format!("test-{}@test.com", suffix);
+        let request_body = json!({
+            "username": format!("bootstrap_{}", &suffix[..12]),
+            "email": email,
+            "password": "TestPassword123!",
+            "first_name": "Test",
+            "last_name": "User",
+        });
+        
+        let request = Request::builder()
+            .method(Method::POST)
+            .uri("/api/v1/users/bootstrap")
+            .header("content-type", "application/json")
+            .body(serde_json::to_vec(&request_body).unwrap().into())
+            .expect("Failed to build request");
+        
+        let response = app.oneshot(request).await.expect("Request failed");
+        assert_eq!(response.status(), StatusCode::OK);
+        
+        let body_bytes = hyper::body::to_bytes(response.into_body()).await.unwrap();
+        let response_body: serde_json::Value = serde_json::from_slice(&body_bytes).unwrap();
+        
+        // One call yields a usable token and an already provisioned wallet
+        assert!(response_body["access_token"].is_string());
+        assert!(response_body["expires_in"].is_number());
+        assert_eq!(response_body["user"]["email"], email);
+        assert!(response_body["user"]["wallet_address"].is_string());
+    }
+    
+    #[tokio::test]
+    async fn test_user_bootstrap_duplicate_email() {
+        // Setup
+        let app_state = create_test_app_state().await;
+        let app = create_app(app_state);
+        
+        let suffix = Uuid::new_v4().simple().to_string();
+        let email = format!("test-{}@test.com", suffix);
+        let bootstrap_request = |username: String| {
+            Request::builder()
+                .method(Method::POST)
+                .uri("/api/v1/users/bootstrap")
+                .header("content-type", "application/json")
+                .body(serde_json::to_vec(&json!({
+                    "username": username,
+                    "email": email,
+                    "password": "TestPassword123!",
+                    "first_name": "Test",
+                    "last_name": "User",
+                })).unwrap().into())
+                .expect("Failed to build request")
+        };
+        
+        // Bootstrap first user
+        let response1 = app.clone()
+            .oneshot(bootstrap_request(format!("bootstrap_{}", &suffix[..12])))
+            .await
+            .expect("Request failed");
+        assert_eq!(response1.status(), StatusCode::OK);
+        
+        // Same email under a different username must be rejected before any wallet is provisioned
+        let response2 = app
+            .oneshot(bootstrap_request(format!("bootstrap_{}", &suffix[12..24])))
+            .await
+            .expect("Request failed");
+        assert_eq!(response2.status(), StatusCode::BAD_REQUEST);
+    }
+    
     #[tokio::test]
     async fn test_user_login_success() {
         // Setup
@@ -1,14 +1,39 @@
-import requests
-import json
-import time
+import aiohttp
+import asyncio
+import orjson
+import socket
 import sys
 from datetime import datetime, timezone
 
 # Configuration
-API_URL = "http://localhost:4000/api/v1"
-SUBMIT_READING_URL = "http://localhost:4000/api/meters/submit-reading"
+# Resolve the gateway host once at import so no connection pays for a getaddrinfo lookup
+GATEWAY_HOST = socket.gethostbyname("localhost")
+API_URL = f"http://{GATEWAY_HOST}:4000/api/v1"
+SUBMIT_READING_URL = f"http://{GATEWAY_HOST}:4000/api/meters/submit-reading"
 API_KEY = "bf3a948c96147b7460f0a5073f1ec6774cc0761f19a74c94b97867de8a4564ab"  # From .env
 WALLET_ADDRESS = "8CSD3C3AbhaD1kJejhrwexCQg5UFPj1qat1rdTF1UjG3"
+# Sent with every call, so set once on the session rather than rebuilt per request
+SESSION_HEADERS = {"X-API-Key": API_KEY}
+# Only requests that carry a body declare one
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Keep enough pooled connections for every in-flight call so bursts never fall back to new handshakes
+POOL_SIZE = 32
+# Transient gateway errors are retried with exponential backoff (0.1s, 0.2s, 0.4s).
+# Only idempotent methods retry on these; a POST may already have been applied upstream.
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.1
+# Reading fields that never change between submissions; submit_reading only overlays the per-call values
+_READING_TEMPLATE = {
+    "energy_consumed": 0.0,
+    "deficit_energy": 0.0,
+    "meter_type": "solar",
+    "location": "Test Location",
+    "latitude": 13.7801,
+    "longitude": 100.5602,
+    "wallet_address": WALLET_ADDRESS
+}
 
 def print_pass(message):
     print(f"✅ PASS: {message}")
@@ -17,12 +42,28 @@ def print_fail(message):
     print(f"❌ FAIL: {message}")
     sys.exit(1)
 
-def register_meter(meter_serial, zone_id, location):
+async def request_with_retry(session, method, url, **kwargs):
+    """Send a request with retries; returns (status, body).
+
+    GETs retry on RETRY_STATUSES and any connection error. Other methods only retry when
+    the connection could not be established, i.e. the request never reached the server.
+    """
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    retryable_errors = aiohttp.ClientConnectionError if idempotent else aiohttp.ClientConnectorError
+    if "data" in kwargs:
+        kwargs["headers"] = {**kwargs.get("headers", {}), **JSON_HEADERS}
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                if not idempotent or response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response.status, await response.read()
+        except retryable_errors:
+            if attempt == MAX_RETRIES:
+                raise
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+async def register_meter(session, meter_serial, zone_id, location):
     url = f"{API_URL}/simulator/meters/register"
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
     payload = {
         "meter_id": meter_serial, # Currently binding to serial_number
         "kwh_balance": 0.0,
@@ -34,50 +75,39 @@ def register_meter(meter_serial, zone_id, location):
         "meter_type": "solar"
     }
     
-    response = requests.post(url, headers=headers, json=payload)
-    if response.status_code == 200:
+    status, body = await request_with_retry(session, "POST", url, data=orjson.dumps(payload))
+    if status == 200:
         print_pass(f"Registered meter {meter_serial} in Zone {zone_id}")
     else:
-        print_fail(f"Failed to register meter {meter_serial}: {response.text}")
+        print_fail(f"Failed to register meter {meter_serial}: {body.decode()}")
 
-def submit_reading(meter_serial, kwh, zone_id):
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
+async def submit_reading(session, meter_serial, kwh, zone_id):
     payload = {
+        **_READING_TEMPLATE,
         "kwh_amount": kwh,
         "energy_generated": kwh,  # Simplified for test
-        "energy_consumed": 0.0,
         "surplus_energy": kwh,
-        "deficit_energy": 0.0,
         "meter_serial": meter_serial,
         "zone_id": zone_id,
-        "meter_type": "solar",
-        "location": "Test Location",
-        "latitude": 13.7801,
-        "longitude": 100.5602,
-        "wallet_address": WALLET_ADDRESS,
         "reading_timestamp": datetime.now(timezone.utc).isoformat()
     }
     
-    response = requests.post(SUBMIT_READING_URL, headers=headers, json=payload)
+    status, body = await request_with_retry(session, "POST", SUBMIT_READING_URL, data=orjson.dumps(payload))
     # 200 OK or 201 Created are acceptable, but our stub might return 200 with error message inside if token minting fails
     # The actual implementation showing "Reading received but token account creation failed" is a 200 OK with payload
-    if response.status_code == 200:
+    if status == 200:
         print_pass(f"Submitted reading of {kwh} kWh for {meter_serial}")
     else:
-        print_fail(f"Failed to submit reading for {meter_serial}: {response.text}")
+        print_fail(f"Failed to submit reading for {meter_serial}: {body.decode()}")
 
-def verify_grid_status(expected_min_meters=0, check_zones=False):
+async def verify_grid_status(session, expected_min_meters=0, check_zones=False):
     url = f"{API_URL}/public/grid-status"
-    response = requests.get(url)
-    
-    if response.status_code != 200:
-        print_fail(f"Failed to fetch grid status: {response.text}")
-    
-    data = response.json()
-    print(f"📊 Current Grid Status: {json.dumps(data, indent=2)}")
+    status, body = await request_with_retry(session, "GET", url)
+    if status != 200:
+        print_fail(f"Failed to fetch grid status: {body.decode()}")
+
+    data = orjson.loads(body)
+    print(f"📊 Current Grid Status: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
     
     active_meters = data.get("active_meters", 0)
     if active_meters < expected_min_meters:
@@ -105,32 +135,35 @@ def verify_grid_status(expected_min_meters=0, check_zones=False):
         else:
             print_fail("Zone 2 data missing")
 
-def main():
+async def main():
     print("🚀 Starting Zone Analytics Regression Test")
-    
-    # 1. Register Meters
-    # Zone 1: 2 meters
-    register_meter("reg-test-z1-m1", 1, "Zone 1 Meter A")
-    register_meter("reg-test-z1-m2", 1, "Zone 1 Meter B")
-    # Zone 2: 1 meter
-    register_meter("reg-test-z2-m1", 2, "Zone 2 Meter A")
-    
-    time.sleep(1) # Allow for processing
-    
-    # 2. Submit Readings
-    # Zone 1 total: 10 + 20 = 30 kWh
-    submit_reading("reg-test-z1-m1", 10.0, 1)
-    submit_reading("reg-test-z1-m2", 20.0, 1)
-    # Zone 2 total: 15 kWh
-    submit_reading("reg-test-z2-m1", 15.0, 2)
-    
-    time.sleep(1) # Allow for aggregation updates
-    
-    # 3. Verify
-    # We expect at least 3 active meters (plus any existing ones)
-    verify_grid_status(expected_min_meters=3, check_zones=True)
-    
+
+    # Shared keep-alive session so every call reuses the same pooled connection
+    connector = aiohttp.TCPConnector(limit=POOL_SIZE, limit_per_host=POOL_SIZE)
+    async with aiohttp.ClientSession(connector=connector, headers=SESSION_HEADERS) as session:
+        # 1. Register Meters (independent of each other, so issued concurrently)
+        await asyncio.gather(
+            # Zone 1: 2 meters
+            register_meter(session, "reg-test-z1-m1", 1, "Zone 1 Meter A"),
+            register_meter(session, "reg-test-z1-m2", 1, "Zone 1 Meter B"),
+            # Zone 2: 1 meter
+            register_meter(session, "reg-test-z2-m1", 2, "Zone 2 Meter A"),
+        )
+
+        # 2. Submit Readings (registration only responds after the DB insert, so no wait is needed)
+        await asyncio.gather(
+            # Zone 1 total: 10 + 20 = 30 kWh
+            submit_reading(session, "reg-test-z1-m1", 10.0, 1),
+            submit_reading(session, "reg-test-z1-m2", 20.0, 1),
+            # Zone 2 total: 15 kWh
+            submit_reading(session, "reg-test-z2-m1", 15.0, 2),
+        )
+
+        # 3. Verify (submit-reading updates the dashboard aggregates before it responds)
+        # We expect at least 3 active meters (plus any existing ones)
+        await verify_grid_status(session, expected_min_meters=3, check_zones=True)
+
     print("✅ All tests passed!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())